@@ -43,7 +43,7 @@ class AsynchronousXopt(Xopt):
             except ValueError:
                 input_data = DataFrame(input_data, index=[0])
 
-        logger.debug(f"Submitting {len(input_data)} inputs")
+        logger.debug("Submitting %d inputs", len(input_data))
         input_data = self.prepare_input_data(input_data)
 
         # submit data to evaluator. Futures are keyed on the index of the input data.
@@ -95,7 +95,7 @@ class AsynchronousXopt(Xopt):
         n_generate = self.evaluator.max_workers - self._n_unfinished_futures
 
         # generate samples and submit to evaluator
-        logger.debug(f"Generating {n_generate} candidates")
+        logger.debug("Generating %d candidates", n_generate)
         new_samples = pd.DataFrame(self.generator.generate(n_generate))
 
         # Submit data
@@ -234,7 +234,7 @@ class Xopt(XoptBaseModel):
         n_generate = self.evaluator.max_workers
 
         # generate samples and submit to evaluator
-        logger.debug(f"Generating {n_generate} candidates")
+        logger.debug("Generating %d candidates", n_generate)
         new_samples = self.generator.generate(n_generate)
 
         if new_samples is not None:
@@ -251,8 +251,8 @@ class Xopt(XoptBaseModel):
             if self.max_evaluations is not None:
                 if self.n_data >= self.max_evaluations:
                     logger.info(
-                        "Xopt is done. "
-                        f"Max evaluations {self.max_evaluations} reached."
+                        "Xopt is done. Max evaluations %d reached.",
+                        self.max_evaluations,
                     )
                     break
 
@@ -317,7 +317,7 @@ class Xopt(XoptBaseModel):
             except ValueError:
                 input_data = DataFrame(deepcopy(input_data), index=[0])
 
-        logger.debug(f"Evaluating {len(input_data)} inputs")
+        logger.debug("Evaluating %d inputs", len(input_data))
         self.vocs.validate_input_data(input_data)
 
         # add constants to input data
@@ -351,7 +351,7 @@ class Xopt(XoptBaseModel):
             New data to be added to the internal DataFrame.
 
         """
-        logger.debug(f"Adding {len(new_data)} new data to internal dataframes")
+        logger.debug("Adding %d new data to internal dataframes", len(new_data))
 
         # Set internal dataframe.
         if self.data is not None:
@@ -487,7 +487,7 @@ class Xopt(XoptBaseModel):
         else:
             with open(fname, "w") as f:
                 f.write(self.yaml(**kwargs))
-            logger.debug(f"Dumped state to YAML file: {fname}")
+            logger.debug("Dumped state to YAML file: %s", fname)
 
     def dict(self, **kwargs) -> Dict:
         """
@@ -1,4 +1,5 @@
 import logging
+import math
 from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from enum import Enum
 from threading import Lock
@@ -40,6 +41,10 @@ class Evaluator(XoptBaseModel):
         If true, lists of evaluation points will be sent to the evaluator
         function to be processed in parallel instead of evaluated seperately via
         mapping.
+    chunksize : int, default=1
+        Maximum number of evaluation points sent to each worker at once when
+        mapping inputs over the executor. Chunks are limited to
+        `ceil(n_inputs / max_workers)` points so that every worker receives work.
     """
 
     function: Callable
@@ -47,6 +52,7 @@ class Evaluator(XoptBaseModel):
     executor: NormalExecutor = Field(exclude=True)  # Do not serialize
     function_kwargs: dict = Field({})
     vectorized: bool = Field(False)
+    chunksize: int = Field(1, ge=1)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -115,12 +121,15 @@ class Evaluator(XoptBaseModel):
 
             funcs = [self.function] * len(inputs)
             kwargs = [self.function_kwargs] * len(inputs)
+            # limit chunks such that every worker receives inputs
+            chunksize = min(self.chunksize, math.ceil(len(inputs) / self.max_workers))
 
             output_data = self.executor.map(
                 safe_function1_for_map,
                 funcs,
                 inputs,
                 kwargs,
+                chunksize=max(1, chunksize),
             )
 
         return pd.concat(
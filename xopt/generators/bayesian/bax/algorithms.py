@@ -1,13 +1,77 @@
 from abc import ABC, abstractmethod
-from typing import ClassVar, Dict, List, Tuple
+from typing import Callable, ClassVar, Dict, Iterator, List, Tuple
 
+import numpy as np
 import torch
 from botorch.models.model import Model
+from botorch.posteriors import Posterior
+from botorch.sampling import get_sampler
+from botorch.sampling.pathwise import draw_matheron_paths
 from pydantic import Field, PositiveInt
 from torch import Tensor
 
 from xopt.pydantic import XoptBaseModel
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# python limits the number of statically nested blocks in generated mesh kernels
+MAX_MESH_KERNEL_DIM = 16
+_mesh_kernels: Dict[int, Callable] = {}
+
+
+def _get_mesh_kernel(dim: int) -> Callable:
+    """
+    Return a numba compiled function `mesh(lo, hi, n)` that builds the
+    cartesian product of `n` evenly spaced points between `lo` and `hi` along each
+    of `dim` axes. Kernels are generated with one nested loop per axis and cached
+    per dimension.
+    """
+    if dim not in _mesh_kernels:
+        lines = [
+            "def mesh(lo, hi, n):",
+            f"    vals = np.empty(({dim}, n))",
+            f"    for d in range({dim}):",
+            "        if n == 1:",
+            "            vals[d, 0] = lo[d]",
+            "            continue",
+            "        step = (hi[d] - lo[d]) / (n - 1)",
+            "        for k in range(n):",
+            "            if k < n // 2:",
+            "                vals[d, k] = lo[d] + step * k",
+            "            else:",
+            "                vals[d, k] = hi[d] - step * (n - 1 - k)",
+            f"    out = np.empty(({' * '.join(['n'] * dim)}, {dim}))",
+            "    idx = 0",
+        ]
+        indent = "    "
+        for d in range(dim):
+            lines.append(f"{indent}for i{d} in range(n):")
+            indent += "    "
+        lines += [f"{indent}out[idx, {d}] = vals[{d}, i{d}]" for d in range(dim)]
+        lines += [f"{indent}idx += 1", "    return out"]
+
+        namespace = {"np": np}
+        exec("\n".join(lines), namespace)
+        # functions defined with exec have no source file, they cannot be cached
+        # on disk
+        _mesh_kernels[dim] = njit(namespace["mesh"])
+
+    return _mesh_kernels[dim]
+
+
+def draw_qmc_posterior_samples(posterior: Posterior, n_samples: int) -> Tensor:
+    """
+    Draw `n_samples` samples from a posterior using quasi-Monte Carlo (Sobol)
+    base samples when the posterior is small enough to support them, which gives
+    lower variance estimates than i.i.d. samples for the same number of samples.
+    Falls back to i.i.d. normal base samples for large posteriors.
+    """
+    sampler = get_sampler(posterior, sample_shape=torch.Size([n_samples]))
+    return sampler(posterior)
+
 
 class Algorithm(XoptBaseModel, ABC):
     name: ClassVar[str] = "base_algorithm"
@@ -52,23 +116,60 @@ class GridScanAlgorithm(Algorithm, ABC):
             raise ValueError("bounds must have the shape [2, ndim]")
 
         dim = len(bounds[0])
+        if njit is not None and dim <= MAX_MESH_KERNEL_DIM:
+            bounds_np = bounds.detach().cpu().double().numpy()
+            mesh_pts = _get_mesh_kernel(dim)(
+                bounds_np[0], bounds_np[1], self.n_mesh_points
+            )
+            return torch.from_numpy(mesh_pts).to(bounds)
+
         linspace_list = [
-            torch.linspace(bounds.T[i][0], bounds.T[i][1], self.n_mesh_points)
+            torch.linspace(
+                bounds.T[i][0],
+                bounds.T[i][1],
+                self.n_mesh_points,
+                dtype=bounds.dtype,
+                device=bounds.device,
+            )
             for i in range(dim)
         ]
 
-        xx = torch.meshgrid(*linspace_list, indexing="ij")
-        mesh_pts = torch.stack(xx).flatten(start_dim=1).T
+        mesh_pts = torch.cartesian_prod(*linspace_list)
+
+        # cartesian_prod returns a 1D tensor for a single input
+        if dim == 1:
+            mesh_pts = mesh_pts.unsqueeze(-1)
 
         return mesh_pts
 
 
 class GridOptimize(GridScanAlgorithm):
+    """
+    Find execution paths that minimize (or maximize) posterior samples of the
+    virtual objective on a mesh.
+
+    The virtual objective is evaluated in chunks of at most `chunk_size` mesh
+    points by `_evaluate_virtual_objective_chunks`, which subclasses can overwrite
+    to define other virtual objectives without building the full sample tensor.
+    Subclasses that overwrite `evaluate_virtual_objective` instead are still
+    supported, their result is treated as a single chunk.
+    """
+
     observable_names_ordered: List[str] = Field(
         default=["y1"],
         description="names of observable/objective models used in this algorithm",
     )
     minimize: bool = True
+    chunk_size: PositiveInt = Field(
+        default=4096,
+        description="maximum number of points at which posterior samples are "
+        "drawn at once, larger meshes use approximate pathwise samples",
+    )
+    save_posterior_samples: bool = Field(
+        default=False,
+        description="flag to store posterior samples at every mesh point in the "
+        "algorithm results",
+    )
 
     def get_execution_paths(
         self, model: Model, bounds: Tensor
@@ -78,16 +179,36 @@ class GridOptimize(GridScanAlgorithm):
         # build evaluation mesh
         test_points = self.create_mesh(bounds).to(model.models[0].train_targets)
 
-        # get samples of the model posterior at mesh points
-        posterior_samples = self.evaluate_virtual_objective(
-            model, test_points, bounds, self.n_samples
-        )
+        # get points that minimize each sample (execution paths), samples of the
+        # model posterior at mesh points are reduced chunk by chunk
+        y_opt, opt_idx = None, None
+        posterior_samples = [] if self.save_posterior_samples else None
+        chunk_offset = 0
+        # not inference_mode, the model caches built here are reused when the
+        # acquisition function is optimized with autograd
+        with torch.no_grad():
+            for samples in self._get_virtual_objective_chunks(
+                model, test_points, bounds, self.n_samples
+            ):
+                if self.minimize:
+                    chunk_opt, chunk_idx = torch.min(samples, dim=-2)
+                else:
+                    chunk_opt, chunk_idx = torch.max(samples, dim=-2)
+                chunk_idx = chunk_idx + chunk_offset
+                chunk_offset += samples.shape[-2]
 
-        # get points that minimize each sample (execution paths)
-        if self.minimize:
-            y_opt, opt_idx = torch.min(posterior_samples, dim=-2)
-        else:
-            y_opt, opt_idx = torch.max(posterior_samples, dim=-2)
+                if y_opt is None:
+                    y_opt, opt_idx = chunk_opt, chunk_idx
+                else:
+                    if self.minimize:
+                        improved = chunk_opt < y_opt
+                    else:
+                        improved = chunk_opt > y_opt
+                    y_opt = torch.where(improved, chunk_opt, y_opt)
+                    opt_idx = torch.where(improved, chunk_idx, opt_idx)
+
+                if posterior_samples is not None:
+                    posterior_samples.append(samples)
 
         opt_idx = opt_idx.squeeze(dim=[-1])
         x_opt = test_points[opt_idx]
@@ -100,11 +221,12 @@ class GridOptimize(GridScanAlgorithm):
         # collect secondary results in a dict
         results_dict = {
             "test_points": test_points,
-            "posterior_samples": posterior_samples,
             "execution_paths": torch.hstack((x_opt, y_opt)),
             "solution_center": solution_center,
             "solution_entropy": solution_entropy,
         }
+        if posterior_samples is not None:
+            results_dict["posterior_samples"] = torch.cat(posterior_samples, dim=-2)
 
         # return execution paths
         return x_opt.unsqueeze(-2), y_opt.unsqueeze(-2), results_dict
@@ -118,35 +240,90 @@ class GridOptimize(GridScanAlgorithm):
         tkwargs: dict = None,
     ) -> Tensor:
         """Evaluate virtual objective (samples)"""
-
-        # get samples of the model posterior at inputs given by x
         with torch.no_grad():
-            post = model.posterior(x)
-            objective_values = post.rsample(torch.Size([n_samples]))
+            objective_values = torch.cat(
+                list(
+                    self._evaluate_virtual_objective_chunks(model, x, bounds, n_samples)
+                ),
+                dim=-2,
+            )
 
         return objective_values
 
+    def _get_virtual_objective_chunks(
+        self, model: Model, x: Tensor, bounds: Tensor, n_samples: int
+    ) -> Iterator[Tensor]:
+        """
+        Return the virtual objective at `x` in chunks, respecting subclasses that
+        overwrite `evaluate_virtual_objective` directly.
+        """
+        if (
+            type(self).evaluate_virtual_objective
+            is not GridOptimize.evaluate_virtual_objective
+        ):
+            return iter([self.evaluate_virtual_objective(model, x, bounds, n_samples)])
+        return self._evaluate_virtual_objective_chunks(model, x, bounds, n_samples)
+
+    def _evaluate_virtual_objective_chunks(
+        self, model: Model, x: Tensor, bounds: Tensor, n_samples: int
+    ) -> Iterator[Tensor]:
+        """
+        Yield the virtual objective at `x` in chunks along the point dimension,
+        each with shape `n_samples x chunk x n_outputs`. Subclasses overwrite this
+        method to define other virtual objectives.
+        """
+        # get samples of the model posterior at inputs given by x
+        yield from self._sample_posterior_chunks(model, x, n_samples)
+
+    def _sample_posterior_chunks(
+        self, model: Model, x: Tensor, n_samples: int
+    ) -> Iterator[Tensor]:
+        """
+        Yield samples of the model posterior at `x` in chunks of at most
+        `chunk_size` points, each with shape `n_samples x chunk x n_outputs`.
+
+        If every point fits in a single chunk the samples are drawn from the
+        joint posterior. Otherwise joint sampling is intractable and approximate
+        function samples are drawn using pathwise conditioning, such that the
+        samples in every chunk belong to the same function draws. Models with
+        kernels that do not support pathwise conditioning fall back to sampling
+        the joint posterior at every point.
+        """
+        if x.shape[0] <= self.chunk_size:
+            yield draw_qmc_posterior_samples(model.posterior(x), n_samples)
+            return
+
+        # draw function samples for each output model
+        sub_models = getattr(model, "models", [model])
+        try:
+            paths = [
+                draw_matheron_paths(sub_model, sample_shape=torch.Size([n_samples]))
+                for sub_model in sub_models
+            ]
+        except NotImplementedError:
+            yield draw_qmc_posterior_samples(model.posterior(x), n_samples)
+            return
+
+        for x_chunk in torch.split(x, self.chunk_size):
+            yield torch.stack([path(x_chunk) for path in paths], dim=-1)
+
 
 class CurvatureGridOptimize(GridOptimize):
     use_mean: bool = False
 
-    def evaluate_virtual_objective(
-        self,
-        model: Model,
-        x: Tensor,
-        bounds: Tensor,
-        n_samples: int,
-        tkwargs: dict = None,
-    ) -> Tensor:
-        """Evaluate virtual objective (samples)"""
-
+    def _evaluate_virtual_objective_chunks(
+        self, model: Model, x: Tensor, bounds: Tensor, n_samples: int
+    ) -> Iterator[Tensor]:
+        """
+        Yield the curvature of the model posterior samples at `x` as a single
+        chunk, the finite differences require neighbouring mesh points.
+        """
         # get samples of the model posterior at inputs given by x
-        with torch.no_grad():
-            post = model.posterior(x)
-            if self.use_mean:
-                objective_values = post.mean.unsqueeze(0)
-            else:
-                objective_values = post.rsample(torch.Size([n_samples]))
+        post = model.posterior(x)
+        if self.use_mean:
+            objective_values = post.mean.unsqueeze(0)
+        else:
+            objective_values = draw_qmc_posterior_samples(post, n_samples)
 
         # pad sides with a single value on left and right
         # zero second order gradient at edges
@@ -158,4 +335,4 @@ class CurvatureGridOptimize(GridOptimize):
         objective_values[:, 0] = 0
         objective_values[:, -1] = 0
 
-        return objective_values
+        yield objective_values
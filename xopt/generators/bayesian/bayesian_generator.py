@@ -4,11 +4,15 @@ import time
 import warnings
 from abc import ABC, abstractmethod
 from copy import deepcopy
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import torch
-from botorch.acquisition import FixedFeatureAcquisitionFunction, qUpperConfidenceBound
+from botorch.acquisition import (
+    AcquisitionFunction,
+    FixedFeatureAcquisitionFunction,
+    qUpperConfidenceBound,
+)
 from botorch.models.model import Model
 from botorch.sampling import get_sampler
 from botorch.utils.multi_objective import is_non_dominated
@@ -171,6 +175,7 @@ class BayesianGenerator(Generator, ABC):
     memory_length: Optional[PositiveInt] = None
 
     n_candidates: int = 1
+    _acquisition_cache: Optional[Tuple] = None
 
     @field_validator("model", mode="before")
     def validate_torch_modules(cls, v):
@@ -526,6 +531,23 @@ class BayesianGenerator(Generator, ABC):
 
         return acq
 
+    def _get_cached_acquisition(
+        self, model: Model, get_acquisition: Callable[[Model], AcquisitionFunction]
+    ) -> AcquisitionFunction:
+        """
+        Return `get_acquisition(model)`, reusing the acquisition function from the
+        previous call if both the model and the data are the same objects. Data is
+        replaced by a new DataFrame whenever it is added or removed.
+        """
+        if self._acquisition_cache is not None:
+            cached_model, cached_data, acq = self._acquisition_cache
+            if cached_model is model and cached_data is self.data:
+                return acq
+
+        acq = get_acquisition(model)
+        self._acquisition_cache = (model, self.data, acq)
+        return acq
+
     def get_optimum(self):
         """select the best point(s) given by the
         model using the Posterior mean"""
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import torch
 from botorch.acquisition.multi_objective import qNoisyExpectedHypervolumeImprovement
@@ -18,6 +19,9 @@ class MGGPOGenerator(MultiObjectiveBayesianGenerator):
     ga_generator: Optional[CNSGAGenerator] = Field(
         None, description="CNSGA generator used to " "generate candidates"
     )
+    _max_acquisition_samples: int = 2**24
+    _variable_names: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+    _input_cache: Optional[Tuple] = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -30,25 +34,52 @@ class MGGPOGenerator(MultiObjectiveBayesianGenerator):
 
     def propose_candidates(self, model, n_candidates=1):
         ga_candidates = self.ga_generator.generate(n_candidates * 10)
-        ga_candidates = pd.DataFrame(ga_candidates)[self.vocs.variable_names].to_numpy()
-        ga_candidates = torch.unique(
-            torch.tensor(ga_candidates, **self.tkwargs), dim=0
-        ).reshape(-1, 1, self.vocs.n_variables)
+        variable_names = self._get_variable_names()
+        n_var = len(variable_names)
+
+        # copy GA candidates directly into an array ordered by variable name
+        candidate_array = np.empty((len(ga_candidates), n_var))
+        for i, candidate in enumerate(ga_candidates):
+            candidate_array[i] = [candidate[name] for name in variable_names]
+
+        ga_candidates = (
+            torch.from_numpy(_unique_rows(candidate_array))
+            .to(**self.tkwargs)
+            .reshape(-1, 1, n_var)
+        )
 
         if ga_candidates.shape[0] < n_candidates:
             raise RuntimeError("not enough unique solutions generated by the GA!")
 
-        acq_funct = self.get_acquisition(self.model)
-        acq_funct_vals = acq_funct(ga_candidates)
-        best_idxs = torch.argsort(acq_funct_vals, descending=True)[:n_candidates]
+        acq_funct = self.get_acquisition(model)
+
+        # evaluate all candidates as a t-batch, split into chunks such that the
+        # number of monte carlo samples held in memory at once is bounded
+        chunk_size = max(
+            1,
+            self._max_acquisition_samples // (self.n_monte_carlo_samples * n_var),
+        )
+        # not inference_mode, the model caches built here are reused by the cached
+        # acquisition function and must remain usable with autograd
+        with torch.no_grad():
+            acq_funct_vals = torch.cat(
+                [acq_funct(chunk) for chunk in torch.split(ga_candidates, chunk_size)]
+            )
+        best_idxs = torch.topk(acq_funct_vals, n_candidates).indices
 
         candidates = ga_candidates[best_idxs]
-        return candidates.reshape(n_candidates, self.vocs.n_variables)
+        return candidates.reshape(n_candidates, n_var)
 
     def add_data(self, new_data: pd.DataFrame):
+        previous_data = self.data
         super().add_data(new_data)
         self.ga_generator.add_data(self.data)
 
+        # appended rows extend the cached inputs, any other assignment of data
+        # replaces the DataFrame object and invalidates the cache
+        if self._input_cache is not None and self._input_cache[0] is previous_data:
+            self._input_cache = (self.data, *self._input_cache[1:])
+
     def get_acquisition(self, model):
         """
         Returns a function that can be used to evaluate the acquisition function
@@ -56,16 +87,52 @@ class MGGPOGenerator(MultiObjectiveBayesianGenerator):
         if model is None:
             raise ValueError("model cannot be None")
 
-        # get base acquisition function
-        acq = self._get_acquisition(model)
-        return acq
+        return self._get_cached_acquisition(model, self._get_acquisition)
+
+    def _get_variable_names(self) -> Tuple[str, ...]:
+        """
+        Return the sorted variable names, stored until the vocs variables change.
+        """
+        variables = tuple(self.vocs.variables)
+        if self._variable_names is None or self._variable_names[0] != variables:
+            self._variable_names = (variables, tuple(self.vocs.variable_names))
+        return self._variable_names[1]
+
+    def _get_baseline_inputs(self) -> torch.Tensor:
+        """
+        Return the input data as a torch tensor. The tensor is cached and only rows
+        appended through `add_data` since the last call are converted, the cache is
+        rebuilt if the data is replaced, the variables change or the dtype/device
+        changes.
+        """
+        tkwargs = self.tkwargs
+        variable_names = self._get_variable_names()
+        if self._input_cache is not None:
+            cached_data, cached_names, n_cached, inputs = self._input_cache
+            if (
+                cached_data is not self.data
+                or cached_names != variable_names
+                or inputs.dtype != tkwargs["dtype"]
+                or inputs.device.type != torch.device(tkwargs["device"]).type
+            ):
+                self._input_cache = None
+
+        if self._input_cache is None:
+            inputs = self.get_input_data(self.data)
+        elif n_cached < len(self.data):
+            inputs = torch.cat(
+                (inputs, self.get_input_data(self.data.iloc[n_cached:])), dim=0
+            )
+
+        self._input_cache = (self.data, variable_names, len(self.data), inputs)
+        return inputs
 
     def _get_objective(self):
         return create_mobo_objective(self.vocs)
 
     def _get_acquisition(self, model):
         # get reference point from data
-        inputs = self.get_input_data(self.data)
+        inputs = self._get_baseline_inputs()
         sampler = self._get_sampler(model)
 
         acq = qNoisyExpectedHypervolumeImprovement(
@@ -80,3 +147,14 @@ class MGGPOGenerator(MultiObjectiveBayesianGenerator):
         )
 
         return acq
+
+
+def _unique_rows(x: np.ndarray) -> np.ndarray:
+    """remove duplicate rows from a 2D array using a single hashing pass over the
+    raw bytes of each row (avoids the sort done by `torch.unique`), the order of
+    first occurrences is preserved"""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    first_idx = {}
+    for idx, row in enumerate(x):
+        first_idx.setdefault(row.tobytes(), idx)
+    return x[list(first_idx.values())]
@@ -1,6 +1,6 @@
 import logging
 from copy import deepcopy
-from typing import Callable, Dict, Literal, Optional
+from typing import Callable, Dict, Literal, Optional, Tuple
 
 import pandas as pd
 import torch
@@ -9,13 +9,18 @@ from botorch.acquisition import (
     GenericMCObjective,
     qUpperConfidenceBound,
 )
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, SerializeAsAny
 
 from xopt.generators.bayesian.custom_botorch.constrained_acquisition import (
     ConstrainedMCAcquisitionFunction,
 )
 from xopt.generators.bayesian.custom_botorch.multi_fidelity import NMOMF
 from xopt.generators.bayesian.mobo import MOBOGenerator
+from xopt.numerical_optimizer import (
+    GridOptimizer,
+    LBFGSOptimizer,
+    NumericalOptimizer,
+)
 from xopt.vocs import ObjectiveEnum, VOCS
 
 logger = logging.getLogger()
@@ -33,13 +38,43 @@ class MultiFidelityGenerator(MOBOGenerator):
         exclude=True,
     )
     reference_point: Optional[Dict[str, float]] = None
+    numerical_optimizer: SerializeAsAny[NumericalOptimizer] = Field(
+        LBFGSOptimizer(batched_restarts=True),
+        description="optimizer used to optimize the acquisition function",
+    )
     supports_multi_objective: bool = True
     supports_batch_generation: bool = True
+    _fidelity_variable_index: Optional[Tuple[Tuple[str, ...], int]] = None
 
     __doc__ = """Implements Multi-fidelity Bayesian optimization
         Assumes a fidelity parameter [0,1]
         """
 
+    @field_validator("numerical_optimizer", mode="before")
+    def validate_numerical_optimizer(cls, value):
+        """note default behavior is LBFGS with batched restarts"""
+        optimizer_dict = {"grid": GridOptimizer, "LBFGS": LBFGSOptimizer}
+        if value is None:
+            value = LBFGSOptimizer(batched_restarts=True)
+        elif isinstance(value, NumericalOptimizer):
+            pass
+        elif isinstance(value, str):
+            if value == "LBFGS":
+                value = LBFGSOptimizer(batched_restarts=True)
+            elif value in optimizer_dict:
+                value = optimizer_dict[value]()
+            else:
+                raise ValueError(f"{value} not found")
+        elif isinstance(value, dict):
+            name = value.pop("name")
+            if name == "LBFGS":
+                value = LBFGSOptimizer(**{"batched_restarts": True, **value})
+            elif name in optimizer_dict:
+                value = optimizer_dict[name](**value)
+            else:
+                raise ValueError(f"{value} not found")
+        return value
+
     @field_validator("vocs", mode="before")
     def validate_vocs(cls, v: VOCS):
         v.variables["s"] = [0, 1]
@@ -87,9 +122,7 @@ class MultiFidelityGenerator(MOBOGenerator):
         if model is None:
             raise ValueError("model cannot be None")
 
-        # get base acquisition function
-        acq = self._get_acquisition(model)
-        return acq
+        return self._get_cached_acquisition(model, self._get_acquisition)
 
     def _get_acquisition(self, model):
         """
@@ -113,8 +146,10 @@ class MultiFidelityGenerator(MOBOGenerator):
         X_baseline = self.get_input_data(self.data)
 
         # wrap the cost function such that it only has to accept the fidelity parameter
+        fidelity_index = self.fidelity_variable_index
+
         def true_cost_function(X):
-            return self.cost_function(X[..., self.fidelity_variable_index])
+            return self.cost_function(X[..., fidelity_index])
 
         acq_func = NMOMF(
             model=model,
@@ -145,12 +180,31 @@ class MultiFidelityGenerator(MOBOGenerator):
 
     @property
     def fidelity_variable_index(self):
-        return self.vocs.variable_names.index(self.fidelity_parameter)
+        # variable names are sorted on every access, store the fidelity index
+        # until the variables change
+        variables = tuple(self.vocs.variables)
+        if (
+            self._fidelity_variable_index is None
+            or self._fidelity_variable_index[0] != variables
+        ):
+            self._fidelity_variable_index = (
+                variables,
+                self.vocs.variable_names.index(self.fidelity_parameter),
+            )
+        return self._fidelity_variable_index[1]
 
     @property
     def fidelity_objective_index(self):
         return self.vocs.objective_names.index(self.fidelity_parameter)
 
+    def _get_bounds_without_fidelity(self) -> torch.Tensor:
+        """Return the variable bounds with the fidelity parameter removed"""
+        bounds = self._get_bounds()
+        fidelity_index = self.fidelity_variable_index
+        return torch.cat(
+            (bounds[:, :fidelity_index], bounds[:, fidelity_index + 1 :]), dim=-1
+        )
+
     def get_optimum(self):
         """select the best point at the maximum fidelity"""
 
@@ -180,13 +234,7 @@ class MultiFidelityGenerator(MOBOGenerator):
             [1.0],
         )
 
-        boundst = self._get_bounds().T
-        fixed_bounds = torch.cat(
-            (
-                boundst[: self.fidelity_variable_index],
-                boundst[self.fidelity_variable_index + 1 :],
-            )
-        ).T
+        fixed_bounds = self._get_bounds_without_fidelity()
 
         result = self.numerical_optimizer.optimize(
             max_fidelity_c_posterior_mean, fixed_bounds, 1
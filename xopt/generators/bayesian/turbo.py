@@ -3,13 +3,19 @@ import math
 from abc import ABC, abstractmethod
 from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 import torch
 from pydantic import ConfigDict, Field, PositiveFloat, PositiveInt
 from torch import Tensor
 
 from xopt.pydantic import XoptBaseModel
-from xopt.vocs import VOCS
+from xopt.vocs import get_constraint_direction, VOCS
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 logger = logging.getLogger()
 
@@ -22,6 +28,54 @@ https://proceedings.neurips.cc/paper/2019/file/6c990b7aca7bc7058f5e98ea909e924b-
 """
 
 
+def _reduce_loop(
+    objective: np.ndarray,
+    constraints: np.ndarray,
+    targets: np.ndarray,
+    directions: np.ndarray,
+) -> int:
+    """
+    Single pass feasibility check and argmin over `objective`. Row `i` is feasible
+    if `directions[j] * (constraints[i, j] - targets[j]) >= 0` for every
+    constraint `j`, nan values are infeasible. Returns the index of the smallest
+    feasible, non-nan objective or -1 if there is none.
+    """
+    n, n_constraints = constraints.shape
+    best_idx = -1
+    best_value = np.inf
+    for i in range(n):
+        if np.isnan(objective[i]) or (best_idx != -1 and objective[i] >= best_value):
+            continue
+        feasible = True
+        for j in range(n_constraints):
+            if not directions[j] * (constraints[i, j] - targets[j]) >= 0.0:
+                feasible = False
+                break
+        if feasible:
+            best_idx = i
+            best_value = objective[i]
+    return best_idx
+
+
+def _reduce_numpy(
+    objective: np.ndarray,
+    constraints: np.ndarray,
+    targets: np.ndarray,
+    directions: np.ndarray,
+) -> int:
+    """numpy equivalent of `_reduce_loop`, used when numba is not installed"""
+    with np.errstate(invalid="ignore"):
+        feasible = np.all(directions * (constraints - targets) >= 0.0, axis=1)
+    valid = feasible & ~np.isnan(objective)
+    if not valid.any():
+        return -1
+    return int(np.argmin(np.where(valid, objective, np.inf)))
+
+
+# nan handling must be preserved so the kernel is compiled without fastmath
+_reduce = _reduce_numpy if njit is None else njit(cache=True)(_reduce_loop)
+
+
 class TurboController(XoptBaseModel, ABC):
     vocs: VOCS = Field(exclude=True)
     dim: PositiveInt
@@ -164,27 +218,108 @@ class TurboController(XoptBaseModel, ABC):
 class OptimizeTurboController(TurboController):
     name: str = Field("optimize", frozen=True)
     best_value: Optional[float] = None
+    _last_seen_len: int = 0
+    _last_seen_row: Optional[np.ndarray] = None
+    _best_idx: Optional[int] = None
+    _best_row: Optional[np.ndarray] = None
 
     @property
     def minimize(self) -> bool:
         return self.vocs.objectives[self.vocs.objective_names[0]] == "MINIMIZE"
 
-    def _set_best_point_value(self, data):
-        # get location of best point so far
-        variable_data = self.vocs.variable_data(data, "")
-        objective_data = self.vocs.objective_data(data, "", return_raw=True)
+    def _get_constraint_arrays(self, data: pd.DataFrame):
+        """
+        Return the constraint values of `data` as a C-contiguous (n, k) array
+        along with the constraint targets and directions expected by `_reduce`.
+        Missing constraint columns are filled with nan and are therefore
+        infeasible.
+        """
+        columns, targets, directions = [], [], []
+        for name, (operator, value) in self.vocs.constraints.items():
+            directions.append(get_constraint_direction(operator))
+            targets.append(float(value))
 
-        if self.minimize:
-            best_idx = objective_data.idxmin()
-            self.best_value = objective_data.min()[self.vocs.objective_names[0]]
+            if name in data:
+                columns.append(data[name].to_numpy(dtype=float))
+            else:
+                columns.append(np.full(len(data), np.nan))
+
+        if columns:
+            constraints = np.ascontiguousarray(np.stack(columns, axis=-1))
         else:
-            best_idx = objective_data.idxmax()
-            self.best_value = objective_data.max()[self.vocs.objective_names[0]]
+            constraints = np.empty((len(data), 0))
+
+        return constraints, np.array(targets), np.array(directions)
 
-        self.center_x = (
-            variable_data.loc[best_idx][self.vocs.variable_names].iloc[0].to_dict()
+    def _best_feasible_index(
+        self, data: pd.DataFrame, minimize: Optional[bool] = None
+    ) -> int:
+        """
+        Return the index of the best feasible objective value in `data` or -1 if
+        there is none. The best value is the minimum if `minimize` is True,
+        defaults to the objective direction in vocs.
+        """
+        minimize = self.minimize if minimize is None else minimize
+        objective = data[self.vocs.objective_names[0]].to_numpy(dtype=float)
+        if not minimize:
+            objective = -objective
+        return _reduce(
+            np.ascontiguousarray(objective), *self._get_constraint_arrays(data)
         )
 
+    def _get_row(self, data: pd.DataFrame, idx: int) -> np.ndarray:
+        """return the variable and objective values in row `idx` of `data`"""
+        names = self.vocs.variable_names + self.vocs.objective_names[:1]
+        return data[names].iloc[idx].to_numpy(dtype=float)
+
+    def _is_appended(self, data: pd.DataFrame) -> bool:
+        """
+        Check if `data` extends the data seen by the last call to
+        `_set_best_point_value`, by comparing the best and last rows seen.
+        """
+        if self._best_idx is None or len(data) < self._last_seen_len:
+            return False
+
+        for idx, row in (
+            (self._best_idx, self._best_row),
+            (self._last_seen_len - 1, self._last_seen_row),
+        ):
+            if not np.array_equal(self._get_row(data, idx), row, equal_nan=True):
+                return False
+
+        return True
+
+    def _set_best_point_value(self, data):
+        """
+        Update the best feasible point and value using only the rows of `data`
+        that were appended since the last call. If the previously seen rows were
+        removed or modified the data is scanned in full.
+        """
+        if not self._is_appended(data):
+            self._last_seen_len = 0
+            self._best_idx = None
+
+        # get location of best feasible point in new data
+        new_data = data.iloc[self._last_seen_len :]
+        idx = self._best_feasible_index(new_data)
+
+        if idx >= 0:
+            value = float(new_data[self.vocs.objective_names[0]].iloc[idx])
+            if self.minimize:
+                improved = self._best_idx is None or value < self.best_value
+            else:
+                improved = self._best_idx is None or value > self.best_value
+
+            if improved:
+                self._best_idx = self._last_seen_len + idx
+                self._best_row = self._get_row(data, self._best_idx)
+                self.best_value = value
+                self.center_x = new_data[self.vocs.variable_names].iloc[idx].to_dict()
+
+        self._last_seen_len = len(data)
+        if len(data):
+            self._last_seen_row = self._get_row(data, -1)
+
     def update_state(self, generator, previous_batch_size: int = 1) -> None:
         """
         Update turbo state class using min of data points that are feasible.
@@ -209,23 +344,20 @@ class OptimizeTurboController(TurboController):
         """
         data = generator.data
 
-        # get locations of valid data samples
-        feas_data = self.vocs.feasibility_data(data)
+        # update the best feasible point with newly added data samples
+        self._set_best_point_value(data)
 
-        if len(data[feas_data["feasible"]]) == 0:
+        if self._best_idx is None:
             raise RuntimeError(
                 "turbo requires at least one valid point in the training dataset"
             )
-        else:
-            self._set_best_point_value(data[feas_data["feasible"]])
 
         # get feasibility of last `n_candidates`
         recent_data = data.iloc[-previous_batch_size:]
-        f_data = self.vocs.feasibility_data(recent_data)
-        recent_f_data = recent_data[f_data["feasible"]]
+        recent_idx = self._best_feasible_index(recent_data, minimize=True)
 
         # if none of the candidates are valid count this as a failure
-        if len(recent_f_data) == 0:
+        if recent_idx < 0:
             self.success_counter = 0
             self.failure_counter += 1
 
@@ -233,7 +365,7 @@ class OptimizeTurboController(TurboController):
             # if we had previous feasible points we need to compare with previous
             # best values, NOTE: this is the opposite of botorch which assumes
             # maximization, xopt assumes minimization
-            Y_last = recent_f_data[self.vocs.objective_names[0]].min()
+            Y_last = float(recent_data[self.vocs.objective_names[0]].iloc[recent_idx])
 
             if Y_last < self.best_value + 1e-3 * math.fabs(self.best_value):
                 self.success_counter += 1
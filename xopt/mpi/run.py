@@ -5,11 +5,9 @@ import sys
 
 import yaml
 from mpi4py import MPI
-from mpi4py.futures import MPICommExecutor
+from mpi4py.futures import MPICommExecutor, MPIPoolExecutor
 
 from xopt import AsynchronousXopt
-
-# from mpi4py.futures import MPIPoolExecutor
 from xopt.base import Xopt
 from xopt.log import set_handler_with_logger
 
@@ -20,7 +18,17 @@ mpi_size = comm.Get_size()
 logger = logging.getLogger("xopt")
 
 
-def run_mpi(config, verbosity=None, asynchronous=True, logfile=None):
+def get_executor():
+    """
+    Return an MPIPoolExecutor using every rank except the root as a worker, or an
+    MPICommExecutor on the root rank if only a single process is available.
+    """
+    if mpi_size > 1:
+        return MPIPoolExecutor(max_workers=mpi_size - 1)
+    return MPICommExecutor(MPI.COMM_WORLD, root=0)
+
+
+def run_mpi(config, verbosity=None, asynchronous=True, logfile=None, chunksize=1):
     """
     Xopt MPI driver
 
@@ -28,6 +36,8 @@ def run_mpi(config, verbosity=None, asynchronous=True, logfile=None):
 
     mpirun -n 4 python -m mpi4py.futures -m xopt.mpi.run xopt.yaml
 
+    Evaluations in batched mode are sent to the workers in chunks of at most
+    `chunksize` points, chunks are limited such that every worker receives work.
 
     """
 
@@ -48,7 +58,7 @@ def run_mpi(config, verbosity=None, asynchronous=True, logfile=None):
 
     # logger.info(xopt_logo)
     # logger.info('_________________________________')
-    logger.info(f"Parallel execution with {mpi_size} workers")
+    logger.info("Parallel execution with %d workers", mpi_size)
 
     if asynchronous:
         logger.info("Enabling async mode")
@@ -56,13 +66,15 @@ def run_mpi(config, verbosity=None, asynchronous=True, logfile=None):
     else:
         X = Xopt(**config)
 
+    X.evaluator.chunksize = chunksize
+    logger.debug("Sending evaluations to workers in chunks of %d", chunksize)
+
     print(X)
     sys.stdout.flush()
-    with MPICommExecutor(MPI.COMM_WORLD, root=0) as executor:
-        # with MPIPoolExecutor() as executor:
-
+    with get_executor() as executor:
         X.evaluator.executor = executor
-        X.evaluator.max_workers = mpi_size
+        # the root rank only distributes work when using an MPIPoolExecutor
+        X.evaluator.max_workers = max(1, mpi_size - 1)
         X.run()
 
 
@@ -82,6 +94,13 @@ if __name__ == "__main__":
         help="Use asynchronous execution",
         default=True,
     )
+    parser.add_argument(
+        "--chunksize",
+        "-c",
+        type=int,
+        help="Maximum number of evaluations sent to each worker at once",
+        default=1,
+    )
 
     args = parser.parse_args()
     print(args)
@@ -90,9 +109,16 @@ if __name__ == "__main__":
     logfile = args.logfile
     verbosity = args.verbose
     asynchronous = args.asynchronous
+    chunksize = args.chunksize
 
     assert os.path.exists(input_file), f"Input file does not exist: {input_file}"
 
     config = yaml.safe_load(open(input_file))
 
-    run_mpi(config, verbosity=verbosity, logfile=logfile, asynchronous=asynchronous)
+    run_mpi(
+        config,
+        verbosity=verbosity,
+        logfile=logfile,
+        asynchronous=asynchronous,
+        chunksize=chunksize,
+    )
@@ -1,14 +1,24 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import torch
 from botorch.acquisition import AcquisitionFunction
 from botorch.optim import optimize_acqf
+from botorch.optim.parameter_constraints import make_scipy_bounds
+from botorch.optim.utils import columnwise_clamp
 from pydantic import ConfigDict, Field, PositiveFloat, PositiveInt
+from scipy.optimize import Bounds, minimize
 from torch import Tensor
 
 from xopt.pydantic import XoptBaseModel
 
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
 
 class NumericalOptimizer(XoptBaseModel, ABC):
     name: str = Field("base_numerical_optimizer", frozen=True)
@@ -32,6 +42,12 @@ class LBFGSOptimizer(NumericalOptimizer):
     max_time: Optional[PositiveFloat] = Field(
         None, description="maximum time for optimizing"
     )
+    batched_restarts: bool = Field(
+        False,
+        description="flag to run an independent L-BFGS-B optimization for each "
+        "restart while evaluating the function once per step for all restarts, "
+        "requires greenlet",
+    )
 
     model_config = ConfigDict(validate_assignment=True)
 
@@ -40,6 +56,10 @@ class LBFGSOptimizer(NumericalOptimizer):
         if len(bounds) != 2:
             raise ValueError("bounds must have the shape [2, ndim]")
 
+        # without greenlet fall back to the default summed multi-start optimization
+        if self.batched_restarts and greenlet is not None:
+            kwargs.setdefault("gen_candidates", gen_candidates_batched_lbfgsb)
+
         candidates, out = optimize_acqf(
             acq_function=function,
             bounds=bounds,
@@ -86,8 +106,9 @@ class GridOptimizer(NumericalOptimizer):
             for i in range(dim)
         ]
 
-        xx = torch.meshgrid(*linspace_list, indexing="ij")
-        mesh_pts = torch.stack(xx).flatten(start_dim=1).T
+        mesh_pts = torch.cartesian_prod(*linspace_list)
+        if dim == 1:
+            mesh_pts = mesh_pts.unsqueeze(-1)
 
         # evaluate the function on grid points
         f_values = function(mesh_pts.unsqueeze(1))
@@ -96,3 +117,171 @@ class GridOptimizer(NumericalOptimizer):
         _, indicies = torch.sort(f_values)
         x_min = mesh_pts[indicies.squeeze().flipud()]
         return x_min[:n_candidates]
+
+
+class _RestartInterrupted(Exception):
+    """raised inside a restart to stop its L-BFGS-B optimization early"""
+
+
+def gen_candidates_batched_lbfgsb(
+    initial_conditions: Tensor,
+    acquisition_function: Union[AcquisitionFunction, Callable],
+    lower_bounds: Optional[Union[float, Tensor]] = None,
+    upper_bounds: Optional[Union[float, Tensor]] = None,
+    options: Optional[Dict] = None,
+    fixed_features: Optional[Dict[int, Optional[float]]] = None,
+    timeout_sec: Optional[float] = None,
+) -> Tuple[Tensor, Tensor]:
+    """
+    Generate candidates using a batched multi-start L-BFGS-B optimization.
+
+    Drop-in replacement for `botorch.generation.gen_candidates_scipy`. Instead of
+    minimizing the sum of the acquisition function over all restarts with a single
+    L-BFGS-B optimizer, every restart keeps its own L-BFGS-B state. The restarts are
+    advanced in lockstep so that each step requires a single batched forward /
+    backward pass of the acquisition function over the restarts that have not yet
+    converged.
+
+    Parameters
+    ----------
+    initial_conditions : Tensor
+        Starting points for optimization, shape `b x q x d`.
+    acquisition_function : AcquisitionFunction
+        Acquisition function to be maximized.
+    lower_bounds : float or Tensor, optional
+        Minimum values for each column of `initial_conditions`.
+    upper_bounds : float or Tensor, optional
+        Maximum values for each column of `initial_conditions`.
+    options : dict, optional
+        Options passed to `scipy.optimize.minimize` for each restart.
+    fixed_features : dict, optional
+        Not supported, must be None or empty.
+    timeout_sec : float, optional
+        Maximum amount of time spent optimizing, after which every restart returns
+        the best point found so far.
+
+    Returns
+    -------
+    Tuple[Tensor, Tensor]
+        Candidates of shape `b x q x d` and the associated acquisition function
+        values of shape `b`.
+
+    """
+    if greenlet is None:
+        raise ImportError("batched L-BFGS-B optimization requires greenlet")
+    if fixed_features:
+        raise NotImplementedError(
+            "fixed features are not supported by batched L-BFGS-B optimization"
+        )
+
+    options = options or {}
+    minimize_options = {
+        key: val
+        for key, val in options.items()
+        if key not in ["method", "callback", "with_grad"]
+    }
+
+    clamped_candidates = columnwise_clamp(
+        initial_conditions, lower_bounds, upper_bounds
+    ).detach()
+    shapeX = clamped_candidates.shape
+    scipy_bounds = make_scipy_bounds(clamped_candidates[0], lower_bounds, upper_bounds)
+    x0s = clamped_candidates.reshape(shapeX[0], -1).cpu().numpy().astype(np.float64)
+
+    def batched_objective(xs: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        X = (
+            torch.from_numpy(np.stack(xs))
+            .to(initial_conditions)
+            .reshape(len(xs), *shapeX[1:])
+            .requires_grad_(True)
+        )
+        loss = -acquisition_function(X).reshape(len(xs), -1).sum(dim=-1)
+        grad = torch.autograd.grad(loss.sum(), X)[0]
+        return (
+            loss.detach().cpu().numpy().astype(np.float64),
+            grad.reshape(len(xs), -1).cpu().numpy().astype(np.float64),
+        )
+
+    x_opt = _lockstep_minimize(
+        batched_objective, x0s, scipy_bounds, minimize_options, timeout_sec
+    )
+
+    candidates = torch.from_numpy(np.stack(x_opt)).to(initial_conditions)
+    candidates = columnwise_clamp(
+        candidates.reshape(shapeX), lower_bounds, upper_bounds
+    )
+    with torch.no_grad():
+        batch_acquisition = acquisition_function(candidates)
+
+    return candidates, batch_acquisition
+
+
+def _lockstep_minimize(
+    batched_objective: Callable,
+    x0s: np.ndarray,
+    bounds: Optional[Bounds],
+    options: Dict,
+    timeout_sec: Optional[float] = None,
+) -> List[np.ndarray]:
+    """
+    Run one L-BFGS-B minimization per starting point in `x0s`, collecting the
+    points requested by every running minimization into a single call of
+    `batched_objective`, which returns the losses and gradients for all points.
+
+    Each minimization runs in a greenlet which switches back to the calling
+    greenlet whenever it needs a function evaluation. Once every running
+    minimization has requested a point, the points are evaluated together and
+    the results are switched back into the minimizations.
+    """
+    parent = greenlet.getcurrent()
+    best_x = [x0.copy() for x0 in x0s]
+    best_f = [np.inf] * len(x0s)
+
+    def run(idx):
+        def fun(x):
+            reply = parent.switch(idx, x.copy())
+            if reply is None:
+                raise _RestartInterrupted
+            if reply[0] < best_f[idx]:
+                best_f[idx], best_x[idx] = reply[0], x.copy()
+            return reply
+
+        try:
+            res = minimize(
+                fun,
+                x0s[idx],
+                method="L-BFGS-B",
+                jac=True,
+                bounds=bounds,
+                options=options,
+            )
+            if res.fun <= best_f[idx]:
+                best_x[idx] = res.x
+        except _RestartInterrupted:
+            pass
+
+        return idx, None
+
+    workers = [greenlet.greenlet(run) for _ in x0s]
+    try:
+        pending = [worker.switch(idx) for idx, worker in enumerate(workers)]
+        pending = [(idx, x) for idx, x in pending if x is not None]
+        start_time = time.monotonic()
+        while pending:
+            if timeout_sec is not None and time.monotonic() - start_time > timeout_sec:
+                replies = [None] * len(pending)
+            else:
+                losses, grads = batched_objective([x for _, x in pending])
+                replies = [(float(loss), grad) for loss, grad in zip(losses, grads)]
+
+            pending = [
+                workers[idx].switch(reply) for (idx, _), reply in zip(pending, replies)
+            ]
+            pending = [(idx, x) for idx, x in pending if x is not None]
+    finally:
+        # kill any minimizations left suspended by an error
+        for worker in workers:
+            if worker:
+                worker.throw()
+
+    return best_x
@@ -1,4 +1,5 @@
 import pickle
+from itertools import product
 from copy import deepcopy
 from unittest.mock import patch
 
@@ -8,13 +9,17 @@ import torch
 from botorch.models import SingleTaskGP
 from botorch.models.model import ModelList
 from botorch.models.transforms import Normalize, Standardize
+from botorch.sampling import SobolQMCNormalSampler
+from gpytorch.kernels import RQKernel
 
 from pydantic import ValidationError
 
 from xopt.base import Xopt
 from xopt.evaluator import Evaluator
+from xopt.generators.bayesian.bax import algorithms
 from xopt.generators.bayesian.bax.algorithms import (
     Algorithm,
+    CurvatureGridOptimize,
     GridOptimize,
     GridScanAlgorithm,
 )
@@ -59,6 +64,34 @@ class TestBaxGenerator:
             assert torch.allclose(mesh, benchmark_mesh)
             assert mesh.shape == torch.Size([10**ndim, ndim])
 
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_create_mesh(self, use_numba):
+        if use_numba and algorithms.njit is None:
+            pytest.skip("numba is not installed")
+
+        njit = algorithms.njit if use_numba else None
+        with patch.object(algorithms, "njit", njit):
+            for n_mesh_points, ndim in product([1, 5], [1, 2, 4]):
+                alg = GridOptimize(n_mesh_points=n_mesh_points)
+                bounds = torch.stack(
+                    [-torch.rand(ndim), torch.rand(ndim) + 1.0]
+                ).double()
+                mesh = alg.create_mesh(bounds)
+
+                xx = torch.meshgrid(
+                    *[
+                        torch.linspace(*b, n_mesh_points, dtype=bounds.dtype)
+                        for b in bounds.T
+                    ],
+                    indexing="ij",
+                )
+                benchmark_mesh = torch.stack(xx).flatten(start_dim=1).T
+                assert mesh.dtype == bounds.dtype
+                assert torch.equal(mesh, benchmark_mesh)
+
+        if use_numba:
+            assert 4 in algorithms._mesh_kernels
+
     def test_grid_minimize(self):
         # test grid scan minimize
         for ndim in [1, 3]:
@@ -112,6 +145,142 @@ class TestBaxGenerator:
                     [alg.n_samples, 11]
                 )
 
+    def test_grid_minimize_chunked(self):
+        ndim = 2
+        bounds = torch.stack([torch.zeros(ndim), torch.ones(ndim)])
+        alg = GridOptimize(chunk_size=7, save_posterior_samples=True)
+
+        train_X = torch.rand(10, ndim)
+        train_Y = torch.rand(10, 1)
+        model = ModelList(
+            SingleTaskGP(
+                train_X,
+                train_Y,
+                input_transform=Normalize(ndim),
+                outcome_transform=Standardize(1),
+            )
+        )
+
+        # mesh is larger than a single chunk, samples are drawn in chunks
+        test_points = alg.create_mesh(bounds)
+        samples = alg.evaluate_virtual_objective(
+            model, test_points, bounds, alg.n_samples
+        )
+        assert samples.shape == torch.Size([alg.n_samples, 100, 1])
+
+        x_exe, y_exe, results = alg.get_execution_paths(model, bounds)
+        assert x_exe.shape == torch.Size([alg.n_samples, 1, ndim])
+        assert y_exe.shape == torch.Size([alg.n_samples, 1, 1])
+
+        # running minimum over chunks matches the minimum over all samples
+        y_min, min_idx = torch.min(results["posterior_samples"], dim=-2)
+        assert torch.allclose(y_exe.squeeze(-2), y_min)
+        assert torch.allclose(x_exe.squeeze(-2), test_points[min_idx.squeeze(-1)])
+
+        # the model still supports autograd after sampling execution paths
+        x = torch.rand(3, ndim, requires_grad=True)
+        model.posterior(x).mean.sum().backward()
+        assert x.grad is not None
+
+    def test_grid_minimize_chunked_unsupported_kernel(self):
+        ndim = 2
+        bounds = torch.stack([torch.zeros(ndim), torch.ones(ndim)])
+        alg = GridOptimize(chunk_size=7)
+
+        # pathwise conditioning does not support rational quadratic kernels,
+        # samples are drawn from the joint posterior instead
+        model = ModelList(
+            SingleTaskGP(
+                torch.rand(10, ndim), torch.rand(10, 1), covar_module=RQKernel()
+            )
+        )
+        test_points = alg.create_mesh(bounds)
+        assert len(test_points) > alg.chunk_size
+        samples = alg.evaluate_virtual_objective(
+            model, test_points, bounds, alg.n_samples
+        )
+        assert samples.shape == torch.Size([alg.n_samples, 100, 1])
+
+        x_exe, y_exe, _ = alg.get_execution_paths(model, bounds)
+        assert x_exe.shape == torch.Size([alg.n_samples, 1, ndim])
+        assert y_exe.shape == torch.Size([alg.n_samples, 1, 1])
+
+    def test_draw_qmc_posterior_samples(self):
+        ndim = 2
+        bounds = torch.stack([torch.zeros(ndim), torch.ones(ndim)])
+        model = ModelList(SingleTaskGP(torch.rand(10, ndim), torch.rand(10, 1)))
+        alg = GridOptimize()
+        test_points = alg.create_mesh(bounds).to(torch.rand(1))
+        assert len(test_points) <= alg.chunk_size
+
+        samplers = []
+        botorch_get_sampler = algorithms.get_sampler
+
+        def get_sampler(*args, **kwargs):
+            samplers.append(botorch_get_sampler(*args, **kwargs))
+            return samplers[-1]
+
+        with patch.object(algorithms, "get_sampler", get_sampler):
+            samples = algorithms.draw_qmc_posterior_samples(
+                model.posterior(test_points), alg.n_samples
+            )
+        # model lists use a list sampler with one sampler per output model
+        assert all(
+            isinstance(sampler, SobolQMCNormalSampler)
+            for sampler in samplers[0].samplers
+        )
+        assert samples.shape == torch.Size([alg.n_samples, 100, 1])
+
+    def test_virtual_objective_hook(self):
+        ndim = 2
+        bounds = torch.stack([torch.zeros(ndim), torch.ones(ndim)])
+        model = ModelList(SingleTaskGP(torch.rand(10, ndim), torch.rand(10, 1)))
+
+        # subclasses that wrap the chunked hook are still evaluated in chunks
+        class NegativeGridOptimize(GridOptimize):
+            n_chunks: int = 0
+
+            def _evaluate_virtual_objective_chunks(self, *args):
+                for samples in super()._evaluate_virtual_objective_chunks(*args):
+                    self.n_chunks += 1
+                    yield -samples
+
+        alg = NegativeGridOptimize(chunk_size=7, save_posterior_samples=True)
+        x_exe, y_exe, results = alg.get_execution_paths(model, bounds)
+        assert alg.n_chunks == 15
+        y_min, _ = torch.min(results["posterior_samples"], dim=-2)
+        assert torch.allclose(y_exe.squeeze(-2), y_min)
+
+        # subclasses that overwrite evaluate_virtual_objective are respected
+        class NegativeOverrideGridOptimize(GridOptimize):
+            def evaluate_virtual_objective(
+                self, model, x, bounds, n_samples, tkwargs=None
+            ):
+                return -super().evaluate_virtual_objective(model, x, bounds, n_samples)
+
+        alg = NegativeOverrideGridOptimize(chunk_size=7, save_posterior_samples=True)
+        with patch.object(
+            NegativeOverrideGridOptimize,
+            "evaluate_virtual_objective",
+            autospec=True,
+            side_effect=NegativeOverrideGridOptimize.evaluate_virtual_objective,
+        ) as evaluate:
+            x_exe, y_exe, results = alg.get_execution_paths(model, bounds)
+        evaluate.assert_called_once()
+        assert results["posterior_samples"].shape == torch.Size([alg.n_samples, 100, 1])
+        y_min, _ = torch.min(results["posterior_samples"], dim=-2)
+        assert torch.allclose(y_exe.squeeze(-2), y_min)
+
+        # curvature is evaluated over the whole mesh at once
+        alg = CurvatureGridOptimize(chunk_size=7)
+        test_points = alg.create_mesh(bounds)
+        samples = alg.evaluate_virtual_objective(
+            model, test_points, bounds, alg.n_samples
+        )
+        assert samples.shape == torch.Size([alg.n_samples, 100, 1])
+        x_exe, y_exe, _ = alg.get_execution_paths(model, bounds)
+        assert x_exe.shape == torch.Size([alg.n_samples, 1, ndim])
+
     def test_generate(self):
         alg = GridOptimize()
 
@@ -163,7 +332,7 @@ class TestBaxGenerator:
 
     def test_in_xopt(self):
         evaluator = Evaluator(function=xtest_callable)
-        alg = GridOptimize()
+        alg = GridOptimize(save_posterior_samples=True)
 
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.objectives = {}
@@ -182,7 +351,7 @@ class TestBaxGenerator:
 
     def test_file_saving(self):
         evaluator = Evaluator(function=xtest_callable)
-        alg = GridOptimize()
+        alg = GridOptimize(save_posterior_samples=True)
 
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.objectives = {}
@@ -1,10 +1,14 @@
 from copy import deepcopy
+from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
+import torch
 
 from xopt.base import Xopt
 from xopt.evaluator import Evaluator
-from xopt.generators.bayesian.mggpo import MGGPOGenerator
+from xopt.generators.bayesian.mggpo import _unique_rows, MGGPOGenerator
+from xopt.generators.ga.cnsga import CNSGAGenerator
 from xopt.resources.test_functions.tnk import evaluate_TNK, tnk_vocs
 from xopt.resources.testing import TEST_VOCS_BASE
 
@@ -44,3 +48,145 @@ class TestMGGPO:
 
         for _ in [0, 1]:
             X.step()
+
+    def test_chunked_acquisition(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+
+        vocs = deepcopy(tnk_vocs)
+        reference_point = {"y1": 3.14, "y2": 3.14}
+        gen = MGGPOGenerator(vocs=vocs, reference_point=reference_point)
+        X = Xopt(evaluator=evaluator, generator=gen, vocs=vocs)
+        X.evaluate_data(pd.DataFrame({"x1": [1.0, 0.75], "x2": [0.75, 1.0]}))
+
+        # evaluate the acquisition function one candidate at a time
+        gen._max_acquisition_samples = 1
+        samples = gen.generate(3)
+        assert pd.DataFrame(samples).to_numpy().shape == (3, 2)
+
+        # chunked values match a single evaluation of all candidates
+        model = gen.train_model()
+        acq = gen.get_acquisition(model)
+        ga_candidates = gen.ga_generator.generate(30)
+        chunk_vals = []
+
+        def record_acq(X):
+            chunk_vals.append(acq(X))
+            return chunk_vals[-1]
+
+        with (
+            patch.object(MGGPOGenerator, "get_acquisition", return_value=record_acq),
+            patch.object(CNSGAGenerator, "generate", return_value=ga_candidates),
+        ):
+            candidates = gen.propose_candidates(model, 3)
+
+        assert len(chunk_vals) > 1
+        chunk_vals = torch.cat(chunk_vals)
+        all_candidates = torch.from_numpy(
+            _unique_rows(pd.DataFrame(ga_candidates)[vocs.variable_names].to_numpy())
+        ).to(**gen.tkwargs)
+        with torch.no_grad():
+            full_vals = acq(all_candidates.unsqueeze(-2))
+
+        assert torch.allclose(chunk_vals, full_vals)
+        best = all_candidates[torch.topk(full_vals, 3).indices]
+        assert torch.allclose(candidates, best)
+
+    def test_acquisition_autograd(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+
+        vocs = deepcopy(tnk_vocs)
+        reference_point = {"y1": 3.14, "y2": 3.14}
+        gen = MGGPOGenerator(vocs=vocs, reference_point=reference_point)
+        X = Xopt(evaluator=evaluator, generator=gen, vocs=vocs)
+        X.evaluate_data(pd.DataFrame({"x1": [1.0, 0.75], "x2": [0.75, 1.0]}))
+        gen.generate(3)
+
+        # the model and cached acquisition function still support autograd
+        x = torch.rand(2, 1, 2, **gen.tkwargs, requires_grad=True)
+        gen.get_acquisition(gen.model)(x).sum().backward()
+        assert x.grad is not None
+
+    def test_acquisition_cache(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+
+        vocs = deepcopy(tnk_vocs)
+        reference_point = {"y1": 3.14, "y2": 3.14}
+        gen = MGGPOGenerator(vocs=vocs, reference_point=reference_point)
+        X = Xopt(evaluator=evaluator, generator=gen, vocs=vocs)
+        X.evaluate_data(pd.DataFrame({"x1": [1.0, 0.75], "x2": [0.75, 1.0]}))
+
+        model = gen.train_model()
+        acq = gen.get_acquisition(model)
+        assert gen.get_acquisition(model) is acq
+
+        # new model or new data rebuilds the acquisition function
+        assert gen.get_acquisition(gen.train_model()) is not acq
+        X.evaluate_data(pd.DataFrame({"x1": [0.5], "x2": [0.5]}))
+        assert gen.get_acquisition(gen.model) is not acq
+
+        # removing data rebuilds the acquisition function
+        acq = gen.get_acquisition(gen.model)
+        X.remove_data([0])
+        assert gen.get_acquisition(gen.model) is not acq
+
+    def test_input_cache(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+
+        vocs = deepcopy(tnk_vocs)
+        reference_point = {"y1": 3.14, "y2": 3.14}
+        gen = MGGPOGenerator(vocs=vocs, reference_point=reference_point)
+        X = Xopt(evaluator=evaluator, generator=gen, vocs=vocs)
+        X.evaluate_data(pd.DataFrame({"x1": [1.0, 0.75], "x2": [0.75, 1.0]}))
+
+        inputs = gen._get_baseline_inputs()
+        assert gen._get_baseline_inputs() is inputs
+
+        # only appended rows are converted
+        X.evaluate_data(pd.DataFrame({"x1": [0.5], "x2": [0.5]}))
+        with patch.object(
+            MGGPOGenerator,
+            "get_input_data",
+            autospec=True,
+            side_effect=MGGPOGenerator.get_input_data,
+        ) as mock_get_input_data:
+            inputs = gen._get_baseline_inputs()
+            assert len(mock_get_input_data.call_args.args[1]) == 1
+        assert torch.equal(inputs, gen.get_input_data(gen.data))
+
+        # shrinking the data rebuilds the cache
+        gen.data = gen.data.iloc[:1]
+        assert torch.equal(gen._get_baseline_inputs(), gen.get_input_data(gen.data))
+
+        # removing data and adding rows back rebuilds the cache
+        X.evaluate_data(pd.DataFrame({"x1": [0.3], "x2": [0.3]}))
+        gen._get_baseline_inputs()
+        X.remove_data([0])
+        X.evaluate_data(pd.DataFrame({"x1": [0.1], "x2": [0.9]}))
+        inputs = gen._get_baseline_inputs()
+        assert torch.equal(inputs, gen.get_input_data(gen.data))
+        assert inputs[-1].tolist() == [0.1, 0.9]
+
+    def test_variable_names(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+
+        vocs = deepcopy(tnk_vocs)
+        reference_point = {"y1": 3.14, "y2": 3.14}
+        gen = MGGPOGenerator(vocs=vocs, reference_point=reference_point)
+        X = Xopt(evaluator=evaluator, generator=gen, vocs=vocs)
+        X.evaluate_data(pd.DataFrame({"x1": [1.0, 0.75], "x2": [0.75, 1.0]}))
+
+        names = gen._get_variable_names()
+        assert names == ("x1", "x2")
+        assert gen._get_variable_names() is names
+        assert gen._get_baseline_inputs().shape == torch.Size([2, 2])
+
+        # changing the vocs variables updates the names and the cached inputs
+        gen.vocs.variables.pop("x2")
+        assert gen._get_variable_names() == ("x1",)
+        assert gen._get_baseline_inputs().shape == torch.Size([2, 1])
+
+    def test_unique_rows(self):
+        x = np.array([[0.5, 1.0], [0.25, 0.0], [0.5, 1.0], [0.5, 0.0], [0.25, 0.0]])
+        assert np.array_equal(
+            _unique_rows(x), np.array([[0.5, 1.0], [0.25, 0.0], [0.5, 0.0]])
+        )
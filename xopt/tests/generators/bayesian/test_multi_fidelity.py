@@ -5,6 +5,7 @@ import torch
 from pandas import Series
 
 from xopt.generators.bayesian.multi_fidelity import MultiFidelityGenerator
+from xopt.numerical_optimizer import GridOptimizer, LBFGSOptimizer
 from xopt.resources.test_functions.tnk import tnk_vocs
 from xopt.resources.testing import TEST_VOCS_BASE, TEST_VOCS_DATA
 
@@ -21,6 +22,31 @@ class TestMultiFidelityGenerator:
         assert pt == {"s": 0.0, "y1": 100.0}
         assert gen.vocs.objective_names == ["s", "y1"]
 
+    def test_numerical_optimizer(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        vocs.constraints = {}
+
+        # LBFGS uses batched restarts by default
+        assert MultiFidelityGenerator(
+            vocs=deepcopy(vocs)
+        ).numerical_optimizer.batched_restarts
+        for value in [None, "LBFGS", {"name": "LBFGS", "n_restarts": 5}]:
+            gen = MultiFidelityGenerator(vocs=deepcopy(vocs), numerical_optimizer=value)
+            assert isinstance(gen.numerical_optimizer, LBFGSOptimizer)
+            assert gen.numerical_optimizer.batched_restarts
+
+        gen = MultiFidelityGenerator(
+            vocs=deepcopy(vocs),
+            numerical_optimizer={"name": "LBFGS", "batched_restarts": False},
+        )
+        assert not gen.numerical_optimizer.batched_restarts
+
+        gen = MultiFidelityGenerator(vocs=deepcopy(vocs), numerical_optimizer="grid")
+        assert isinstance(gen.numerical_optimizer, GridOptimizer)
+
+        with pytest.raises(ValueError):
+            MultiFidelityGenerator(vocs=deepcopy(vocs), numerical_optimizer="bad")
+
     def test_add_data(self):
         vocs = deepcopy(TEST_VOCS_BASE)
         vocs.constraints = {}
@@ -61,6 +87,31 @@ class TestMultiFidelityGenerator:
 
         generator.train_model(generator.data)
 
+    def test_fidelity_bounds(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        vocs.constraints = {}
+
+        gen = MultiFidelityGenerator(vocs=vocs)
+        bounds = gen._get_bounds()
+        bounds_no_fid = gen._get_bounds_without_fidelity()
+        fid_idx = gen.fidelity_variable_index
+
+        assert bounds_no_fid.shape == (2, vocs.n_variables - 1)
+        keep = [i for i in range(bounds.shape[-1]) if i != fid_idx]
+        assert torch.equal(bounds_no_fid, bounds[:, keep])
+
+        # adding a variable ahead of the fidelity parameter moves its index
+        gen.vocs.variables["a"] = [2.0, 3.0]
+        assert gen.fidelity_variable_index == fid_idx + 1
+        new_bounds = gen._get_bounds()
+        new_bounds_no_fid = gen._get_bounds_without_fidelity()
+        assert torch.equal(
+            new_bounds_no_fid[:, : fid_idx + 1], new_bounds[:, : fid_idx + 1]
+        )
+        assert torch.equal(
+            new_bounds_no_fid[:, fid_idx + 1 :], new_bounds[:, fid_idx + 2 :]
+        )
+
     def test_acq(self):
         vocs = deepcopy(TEST_VOCS_BASE)
         vocs.constraints = {}
@@ -81,6 +132,11 @@ class TestMultiFidelityGenerator:
         test_x = torch.rand(3, 1, 3).double()
         acq(test_x)
 
+        # acquisition function is reused until the model or data changes
+        assert generator.get_acquisition(generator.model) is acq
+        generator.train_model()
+        assert generator.get_acquisition(generator.model) is not acq
+
         # test total cost
         assert (
             generator.calculate_total_cost()
@@ -2,7 +2,6 @@ import math
 import os
 from copy import deepcopy
 from unittest import TestCase
-from unittest.mock import patch
 import json
 
 import numpy as np
@@ -16,6 +15,8 @@ from xopt.generators.bayesian.bax.algorithms import GridOptimize
 from xopt.generators.bayesian.bax_generator import BaxGenerator
 from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
 from xopt.generators.bayesian.turbo import (
+    _reduce_loop,
+    _reduce_numpy,
     EntropyTurboController,
     OptimizeTurboController,
     SafetyTurboController,
@@ -23,6 +24,11 @@ from xopt.generators.bayesian.turbo import (
 from xopt.resources.testing import TEST_VOCS_BASE, TEST_VOCS_DATA
 
 
+class _ConcreteBG(BayesianGenerator):
+    def _get_acquisition(self, model):
+        return None
+
+
 def sin_function(input_dict):
     x = input_dict["x"]
     return {"f": -10 * np.exp(-((x - np.pi) ** 2) / 0.01) + 0.5 * np.sin(5 * x)}
@@ -46,49 +52,45 @@ class TestTurbo(TestCase):
         assert state.success_tolerance == 2
         assert not state.minimize
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_turbo_validation(self):
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.variables = {"x1": [0, 1]}
 
         turbo_controller = OptimizeTurboController(test_vocs)
-        BayesianGenerator(vocs=test_vocs, turbo_controller=turbo_controller)
+        _ConcreteBG(vocs=test_vocs, turbo_controller=turbo_controller)
 
         turbo_controller = {"name": "optimize", "length": 0.5}
-        gen = BayesianGenerator(vocs=test_vocs, turbo_controller=turbo_controller)
+        gen = _ConcreteBG(vocs=test_vocs, turbo_controller=turbo_controller)
         assert gen.turbo_controller.length == 0.5
 
         # turbo controller dict needs to have a name attribute
         with pytest.raises(ValueError):
-            BayesianGenerator(
-                vocs=test_vocs, turbo_controller={"bad_keyword": "result"}
-            )
+            _ConcreteBG(vocs=test_vocs, turbo_controller={"bad_keyword": "result"})
 
         # test specifying controller via string
-        BayesianGenerator(vocs=test_vocs, turbo_controller="optimize")
+        _ConcreteBG(vocs=test_vocs, turbo_controller="optimize")
 
         with pytest.raises(ValueError):
-            BayesianGenerator(vocs=test_vocs, turbo_controller="bad_controller")
+            _ConcreteBG(vocs=test_vocs, turbo_controller="bad_controller")
 
         # test not allowed generator type
         with pytest.raises(ValueError):
-            BayesianGenerator(
+            _ConcreteBG(
                 vocs=test_vocs, turbo_controller=EntropyTurboController(test_vocs)
             )
 
         # test validation from serialized turbo controller
-        gen = BayesianGenerator(vocs=test_vocs, turbo_controller=turbo_controller)
+        gen = _ConcreteBG(vocs=test_vocs, turbo_controller=turbo_controller)
         gen.add_data(TEST_VOCS_DATA)
         gen_dict = json.loads(gen.to_json())
         gen.from_dict(gen_dict | {"vocs": test_vocs})
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_get_trust_region(self):
         # test in 1D
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.variables = {"x1": [0, 1]}
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(TEST_VOCS_DATA)
         gen.train_model()
 
@@ -100,7 +102,7 @@ class TestTurbo(TestCase):
 
         # test in 2D
         test_vocs = deepcopy(TEST_VOCS_BASE)
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(TEST_VOCS_DATA)
         gen.train_model()
 
@@ -111,12 +113,11 @@ class TestTurbo(TestCase):
         assert np.all(tr[0].numpy() >= test_vocs.bounds[0])
         assert np.all(tr[1].numpy() <= test_vocs.bounds[1])
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_restrict_data(self):
         # test in 1D
         test_vocs = deepcopy(TEST_VOCS_BASE)
 
-        gen = BayesianGenerator(
+        gen = _ConcreteBG(
             vocs=test_vocs, turbo_controller=OptimizeTurboController(test_vocs)
         )
         gen.add_data(TEST_VOCS_DATA)
@@ -128,7 +129,6 @@ class TestTurbo(TestCase):
             restricted_data["x1"].to_numpy(), np.array([0.45, 0.56, 0.67])
         )
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_with_constraints(self):
         # test in 1D
         test_vocs = deepcopy(TEST_VOCS_BASE)
@@ -143,7 +143,7 @@ class TestTurbo(TestCase):
         data["y1"] = y_data
         best_x = data["x1"].iloc[5]
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(data)
         gen.train_model()
 
@@ -174,7 +174,7 @@ class TestTurbo(TestCase):
         y_data[5] = -1
         data["y1"] = y_data
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(data)
 
         turbo_state = OptimizeTurboController(gen.vocs)
@@ -192,7 +192,7 @@ class TestTurbo(TestCase):
         data["y1"] = y_data
         best_x = data["x1"].iloc[6]
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(data)
 
         turbo_state = OptimizeTurboController(gen.vocs, failure_tolerance=5)
@@ -210,19 +210,18 @@ class TestTurbo(TestCase):
         data["y1"] = y_data
         best_x = data["x1"].iloc[6]
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(data)
 
         turbo_state = OptimizeTurboController(gen.vocs, failure_tolerance=5)
         turbo_state.update_state(gen)
         assert turbo_state.center_x == {"x1": best_x}
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_set_best_point(self):
         test_vocs = deepcopy(TEST_VOCS_BASE)
 
         turbo_state = OptimizeTurboController(test_vocs)
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(TEST_VOCS_DATA)
 
         turbo_state.update_state(gen)
@@ -243,7 +242,7 @@ class TestTurbo(TestCase):
 
         turbo_state = OptimizeTurboController(test_vocs)
         assert not turbo_state.minimize
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(TEST_VOCS_DATA)
 
         turbo_state.update_state(gen)
@@ -252,7 +251,106 @@ class TestTurbo(TestCase):
         ].max()[test_vocs.objective_names[0]]
         assert turbo_state.best_value == best_value
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
+    def test_incremental_best_point(self):
+        test_vocs = deepcopy(TEST_VOCS_BASE)
+        test_vocs.variables = {"x1": [0, 1]}
+        test_vocs.constraints = {"c1": ["LESS_THAN", 0.0]}
+
+        data = deepcopy(TEST_VOCS_DATA)
+        data["c1"] = -10.0
+        data["y1"] = np.ones(10)
+        data.loc[3, "y1"] = 0.5
+
+        gen = _ConcreteBG(vocs=test_vocs)
+        gen.add_data(data)
+
+        turbo_state = OptimizeTurboController(gen.vocs, failure_tolerance=5)
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == 0.5
+        assert turbo_state.center_x == {"x1": data["x1"].iloc[3]}
+
+        # new infeasible point with a better objective does not change the center
+        gen.add_data(pd.DataFrame({"x1": [0.2], "y1": [-5.0], "c1": [1.0]}))
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == 0.5
+        assert turbo_state.center_x == {"x1": data["x1"].iloc[3]}
+
+        # new feasible point with a better objective updates the center
+        gen.add_data(pd.DataFrame({"x1": [0.3], "y1": [-1.0], "c1": [-1.0]}))
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == -1.0
+        assert turbo_state.center_x == {"x1": 0.3}
+        assert turbo_state.success_counter == 1
+
+        # replacing the data with a smaller data set triggers a full rescan
+        gen.data = data
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == 0.5
+        assert turbo_state.center_x == {"x1": data["x1"].iloc[3]}
+
+        # removing the best point and adding data triggers a full rescan
+        gen.data = data.drop(labels=[3]).reset_index(drop=True)
+        gen.add_data(pd.DataFrame({"x1": [0.4], "y1": [0.7], "c1": [-1.0]}))
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == 0.7
+        assert turbo_state.center_x == {"x1": 0.4}
+
+        # removing an earlier point keeps the best point but shifts the new rows
+        gen.data = gen.data.drop(labels=[0]).reset_index(drop=True)
+        gen.add_data(pd.DataFrame({"x1": [0.6], "y1": [0.6], "c1": [-1.0]}))
+        turbo_state.update_state(gen)
+        assert turbo_state.best_value == 0.6
+        assert turbo_state.center_x == {"x1": 0.6}
+
+    def test_best_feasible_index(self):
+        test_vocs = deepcopy(TEST_VOCS_BASE)
+        test_vocs.constraints = {
+            "c1": ["GREATER_THAN", 0.5],
+            "c2": ["LESS_THAN", 0.0],
+        }
+        data = pd.DataFrame(
+            {
+                "y1": [5.0, 0.0, -1.0, -2.0, 3.0],
+                "c1": [1.0, 0.0, 1.0, np.nan, 0.5],
+                "c2": [-1.0, -1.0, 1.0, -1.0, 0.0],
+            }
+        )
+
+        turbo_state = OptimizeTurboController(test_vocs)
+
+        # feasibility of each point matches vocs
+        feasible = test_vocs.feasibility_data(data)["feasible"].to_numpy()
+        for i in range(len(data)):
+            idx = turbo_state._best_feasible_index(data.iloc[[i]])
+            assert (idx == 0) == feasible[i]
+
+        assert turbo_state._best_feasible_index(data) == 4
+        assert turbo_state._best_feasible_index(data, minimize=False) == 0
+
+        # missing constraint data is infeasible
+        assert turbo_state._best_feasible_index(data[["y1", "c1"]]) == -1
+
+    def test_reduce_kernels(self):
+        rng = np.random.default_rng(0)
+        objective = rng.standard_normal(50)
+        objective[[3, 10]] = np.nan
+        constraints = rng.standard_normal((50, 2))
+        targets = np.array([-0.5, 0.5])
+        directions = np.array([1.0, -1.0])
+
+        # nan constraints are infeasible
+        np_idx = _reduce_numpy(objective, constraints, targets, directions)
+        constraints[np_idx, 1] = np.nan
+
+        for offset in [-1.0, 0.0, 1.0]:
+            args = (objective, constraints, targets + offset, directions)
+            assert _reduce_loop(*args) == _reduce_numpy(*args)
+        assert _reduce_loop(objective, constraints, targets, directions) != np_idx
+
+        # no valid points
+        assert _reduce_numpy(objective, constraints, targets + 10, directions) == -1
+        assert _reduce_loop(objective, constraints, targets + 10, directions) == -1
+
     def test_batch_turbo(self):
         # test in 1D
         test_vocs = deepcopy(TEST_VOCS_BASE)
@@ -265,7 +363,7 @@ class TestTurbo(TestCase):
         data["c1"] = c_data
         y_data = np.ones(10)
         data["y1"] = y_data
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(data)
 
         turbo_state = OptimizeTurboController(test_vocs, failure_tolerance=5)
@@ -298,7 +396,6 @@ class TestTurbo(TestCase):
         for i in range(2):
             X.step()
 
-    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
     def test_safety(self):
         test_vocs = VOCS(
             variables={"x": [0, 2 * math.pi]},
@@ -310,7 +407,7 @@ class TestTurbo(TestCase):
             {"x": [0.5, 1.0, 1.5], "f": [1.0, 1.0, 1.0], "c": [-1.0, -1.0, 1.0]}
         )
         sturbo = SafetyTurboController(vocs=test_vocs)
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(test_data)
 
         sturbo.update_state(gen)
@@ -323,7 +420,7 @@ class TestTurbo(TestCase):
             {"x": [0.5, 1.0, 1.5], "f": [1.0, 1.0, 1.0], "c": [-1.0, -1.0, -1.0]}
         )
 
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(test_data2)
 
         sturbo.update_state(gen, previous_batch_size=3)
@@ -335,7 +432,7 @@ class TestTurbo(TestCase):
         test_data3 = pd.DataFrame(
             {"x": [0.5, 1.0, 1.5], "f": [1.0, 1.0, 1.0], "c": [-1.0, 1.0, -1.0]}
         )
-        gen = BayesianGenerator(vocs=test_vocs)
+        gen = _ConcreteBG(vocs=test_vocs)
         gen.add_data(test_data3)
 
         sturbo.update_state(gen, previous_batch_size=3)
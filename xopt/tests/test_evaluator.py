@@ -1,3 +1,5 @@
+import os
+import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
@@ -8,6 +10,11 @@ from xopt.generators import RandomGenerator
 from xopt.vocs import VOCS
 
 
+def get_pid(x):
+    time.sleep(0.5)
+    return {"pid": os.getpid()}
+
+
 class TestEvaluator:
     @staticmethod
     def f(x, a=True):
@@ -39,6 +46,30 @@ class TestEvaluator:
         results = evaluator.evaluate_data(candidates)
         assert len(results) == 10
 
+        # test in parallel with chunked mapping
+        evaluator = Evaluator(
+            function=self.f,
+            executor=ProcessPoolExecutor(),
+            max_workers=2,
+            chunksize=4,
+        )
+        results = evaluator.evaluate_data(candidates)
+        assert np.allclose(results["f"], (candidates**2).sum(axis=1))
+
+    def test_chunksize_uses_all_workers(self):
+        # a batch of max_workers points is spread over every worker even if the
+        # chunk size is larger than the batch
+        n_workers = 4
+        evaluator = Evaluator(
+            function=get_pid,
+            executor=ProcessPoolExecutor(max_workers=n_workers),
+            max_workers=n_workers,
+            chunksize=16,
+        )
+        candidates = pd.DataFrame(np.random.rand(n_workers, 2), columns=["x1", "x2"])
+        results = evaluator.evaluate_data(candidates)
+        assert results["pid"].nunique() == n_workers
+
     def test_submit(self):
         evaluator = Evaluator(function=self.f)
         candidates = pd.DataFrame(np.random.rand(10, 2), columns=["x1", "x2"])
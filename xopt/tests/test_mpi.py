@@ -87,6 +87,9 @@ class TestMPI:
         # run asynch mode
         run_mpi(yaml.safe_load(YAML), 0, True, None)
 
+        # run batched mode with an explicit chunk size
+        run_mpi(yaml.safe_load(YAML), 0, False, None, chunksize=8)
+
     @pytest.fixture(scope="module", autouse=True)
     def clean_up(self):
         yield
@@ -4,11 +4,17 @@ from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+import pytest
 import torch
 
-from xopt import Evaluator, Xopt
+from xopt import Evaluator, numerical_optimizer, Xopt
 from xopt.generators.bayesian import BayesianExplorationGenerator
-from xopt.numerical_optimizer import GridOptimizer, LBFGSOptimizer, NumericalOptimizer
+from xopt.numerical_optimizer import (
+    gen_candidates_batched_lbfgsb,
+    GridOptimizer,
+    LBFGSOptimizer,
+    NumericalOptimizer,
+)
 from xopt.resources.test_functions.tnk import evaluate_TNK, tnk_vocs
 
 
@@ -39,6 +45,63 @@ class TestNumericalOptimizers:
             assert time.time() - start_time < 0.01
             assert candidates.shape == torch.Size([ncandidate, ndim])
 
+    def test_batched_lbfgs_optimizer(self):
+        optimizer = LBFGSOptimizer(batched_restarts=True)
+        for ndim in [1, 3]:
+            bounds = torch.stack((torch.zeros(ndim), torch.ones(ndim)))
+            for ncandidate in [1, 3]:
+                candidates = optimizer.optimize(f, bounds, ncandidate)
+                assert candidates.shape == torch.Size([ncandidate, ndim])
+
+    def test_batched_lbfgs_optimizer_fallback(self):
+        # without greenlet the default botorch candidate generation is used
+        bounds = torch.stack((torch.zeros(2), torch.ones(2)))
+        with patch.object(numerical_optimizer, "greenlet", None):
+            with patch.object(
+                numerical_optimizer,
+                "optimize_acqf",
+                wraps=numerical_optimizer.optimize_acqf,
+            ) as mock_optimize_acqf:
+                candidates = LBFGSOptimizer(batched_restarts=True).optimize(
+                    f, bounds, 1
+                )
+                assert "gen_candidates" not in mock_optimize_acqf.call_args.kwargs
+            assert candidates.shape == torch.Size([1, 2])
+
+            with pytest.raises(ImportError):
+                gen_candidates_batched_lbfgsb(torch.rand(5, 1, 2), f)
+
+    @pytest.mark.skipif(numerical_optimizer.greenlet is None, reason="no greenlet")
+    def test_gen_candidates_batched_lbfgsb(self):
+        batch_sizes = []
+
+        def neg_dist(X):
+            batch_sizes.append(X.shape[0])
+            return -torch.sum((X - 0.25) ** 2, dim=(-2, -1))
+
+        initial_conditions = torch.rand(5, 2, 3, dtype=torch.double)
+        candidates, values = gen_candidates_batched_lbfgsb(
+            initial_conditions, neg_dist, lower_bounds=0.0, upper_bounds=1.0
+        )
+        assert candidates.shape == initial_conditions.shape
+        assert values.shape == torch.Size([5])
+        assert torch.allclose(candidates, torch.full_like(candidates, 0.25), atol=1e-4)
+
+        # every step evaluates all running restarts in a single stacked call,
+        # finished restarts drop out of the batch
+        assert batch_sizes[0] == 5
+        assert batch_sizes[-1] == 5  # final evaluation of the candidates
+        steps = batch_sizes[:-1]
+        assert all(a >= b for a, b in zip(steps[:-1], steps[1:]))
+        assert len(steps) < sum(steps)
+
+        # errors raised by the function are propagated
+        def bad_function(X):
+            raise RuntimeError("bad function")
+
+        with pytest.raises(RuntimeError):
+            gen_candidates_batched_lbfgsb(initial_conditions, bad_function)
+
     def test_grid_optimizer(self):
         optimizer = GridOptimizer()
         for ndim in [1, 3]:
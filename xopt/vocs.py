@@ -738,6 +738,21 @@ def form_objective_data(
     return odata
 
 
+def get_constraint_direction(operator: str) -> float:
+    """
+    Return the sign `s` of a constraint operator such that a value `x` satisfies
+    the constraint with target `d` if `s * (x - d) >= 0`, +1 for GREATER_THAN and
+    -1 for LESS_THAN (any case).
+    """
+    op = operator.upper()  # Allow any case
+    if op == "GREATER_THAN":
+        return 1.0
+    elif op == "LESS_THAN":
+        return -1.0
+    else:
+        raise ValueError(f"Unknown constraint operator: {op}")
+
+
 def form_constraint_data(constraints: Dict, data: pd.DataFrame, prefix="constraint_"):
     """
     Use constraint dict and data (dataframe) to generate constraint data (dataframe). A
@@ -772,14 +787,9 @@ def form_constraint_data(constraints: Dict, data: pd.DataFrame, prefix="constrai
 
         x = data[k]
         op, d = constraints[k]
-        op = op.upper()  # Allow any case
 
-        if op == "GREATER_THAN":  # x > d -> x-d > 0
-            cvalues = -(x - d)
-        elif op == "LESS_THAN":  # x < d -> d-x > 0
-            cvalues = -(d - x)
-        else:
-            raise ValueError(f"Unknown constraint operator: {op}")
+        # x > d -> x-d > 0, x < d -> d-x > 0
+        cvalues = -get_constraint_direction(op) * (x - d)
 
         cdata[prefix + k] = cvalues.fillna(np.inf)  # Protect against nans
     return cdata